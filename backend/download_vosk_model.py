@@ -1,57 +1,48 @@
 #!/usr/bin/env python3
 """
 Script to download and set up the Vosk speech recognition model.
-Run this script to download the English model for offline speech recognition.
+Run this script to provision the English model for offline speech recognition.
+
+Models are stored in a shared, versioned cache (TEACHI_MODEL_CACHE, default
+~/.cache/teachi/models) that the backend resolves at startup. Interrupted
+downloads resume on the next run.
+
+    python download_vosk_model.py
+    python download_vosk_model.py --mirror http://school-server/models
+    python download_vosk_model.py --source /media/usb/vosk-model-small-en-us-0.15.zip
 """
 
-import os
-import urllib.request
-import zipfile
+import argparse
 import sys
 
-def download_vosk_model():
-    """Download and extract the Vosk English model"""
-    model_url = "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"
-    model_zip = "vosk-model-small-en-us-0.15.zip"
-    model_dir = "vosk-model-small-en-us-0.15"
-    
-    # Check if model already exists
-    if os.path.exists(model_dir):
-        print(f"Model directory {model_dir} already exists. Skipping download.")
-        return True
-    
-    print("Downloading Vosk English model...")
-    print(f"URL: {model_url}")
-    print("This may take a few minutes depending on your internet connection...")
-    
+from teachi.provisioning import MODELS, ProvisioningError, default_cache_dir, provision
+
+
+def main(argv=None) -> bool:
+    parser = argparse.ArgumentParser(description="Provision a Vosk model into the shared model cache.")
+    parser.add_argument("--model", default="vosk-model-small-en-us-0.15", choices=sorted(MODELS))
+    parser.add_argument("--source", help="archive URL, file:// URL or local path (overrides --mirror)")
+    parser.add_argument("--mirror", help="base URL or directory holding the model archives")
+    parser.add_argument("--sha256", help="expected SHA-256 of the archive")
+    parser.add_argument("--cache-dir", default=default_cache_dir())
+    args = parser.parse_args(argv)
+
     try:
-        # Download the model
-        urllib.request.urlretrieve(model_url, model_zip)
-        print(f"Downloaded {model_zip}")
-        
-        # Extract the model
-        print("Extracting model...")
-        with zipfile.ZipFile(model_zip, 'r') as zip_ref:
-            zip_ref.extractall()
-        
-        # Clean up zip file
-        os.remove(model_zip)
-        print(f"Extracted to {model_dir}")
-        print("Vosk model setup complete!")
+        provision(args.model, args.cache_dir, source=args.source, mirror=args.mirror, sha256=args.sha256)
         return True
-        
-    except Exception as e:
-        print(f"Error downloading model: {e}")
-        print("\nManual download instructions:")
+    except (ProvisioningError, OSError) as e:
+        print(f"Error provisioning model: {e}")
+        print("\nRe-run this script to resume the download, or provision from a local copy:")
         print("1. Visit: https://alphacephei.com/vosk/models")
-        print("2. Download: vosk-model-small-en-us-0.15.zip")
-        print("3. Extract to the backend directory")
+        print(f"2. Download: {args.model}.zip")
+        print(f"3. Run: python download_vosk_model.py --source path/to/{args.model}.zip")
         return False
 
+
 if __name__ == "__main__":
-    success = download_vosk_model()
+    success = main()
     if success:
         print("\n✅ Vosk model is ready for offline speech recognition!")
     else:
-        print("\n❌ Failed to download model. Please download manually.")
+        print("\n❌ Failed to provision model. Please download manually.")
         sys.exit(1)
@@ -0,0 +1,14 @@
+"""Teachi backend: one FastAPI app with pluggable STT, TTS and LLM backends."""
+
+from .config import Settings
+
+__all__ = ["create_app", "Settings"]
+
+
+def __getattr__(name):
+    # Imported lazily so tools like the model provisioner don't need the
+    # server stack (fastapi, numpy, vosk) installed.
+    if name == "create_app":
+        from .app import create_app
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from .assistant import ask, ask_anywhere
+from .config import Settings
+from .dummy_data import lessons, lesson_details
+from .generation import GENERATION_BUDGETS
+from .lessons import define_language, get_lesson_context, get_navigation_context
+from .llm import LLMBackend, LLMError, create_llm
+from .models import AskRequest, ShortcutAction, ShortcutRequest, VoiceRequest
+from .stt import STTBackend, create_stt
+from .tts import TTSBackend, create_tts
+
+
+def create_app(
+    settings: Optional[Settings] = None,
+    stt: Optional[STTBackend] = None,
+    tts: Optional[TTSBackend] = None,
+    llm: Optional[LLMBackend] = None,
+) -> FastAPI:
+    """Build the Teachi API.
+
+    Backends are chosen by ``settings`` (see ``Settings.from_env``); pass
+    instances directly to override them, e.g. in benchmarks.
+    """
+    settings = settings or Settings.from_env()
+    stt = stt or create_stt(settings)
+    tts = tts or create_tts(settings)
+    llm = llm or create_llm(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        tts.close()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.stt = stt
+    app.state.tts = tts
+    app.state.llm = llm
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.exception_handler(LLMError)
+    async def _llm_error(request: Request, exc: LLMError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": {"error": "LLM unavailable", "message": str(exc)}},
+        )
+
+    # -------------------- Endpoints --------------------
+    @app.get("/api/lessons")
+    async def get_lessons():
+        """Get all available lessons."""
+        await asyncio.sleep(0.5)
+        return lessons
+
+    @app.get("/api/lessons/{lesson_id}")
+    async def get_lesson_detail(lesson_id: str):
+        """Get detailed information about a specific lesson."""
+        await asyncio.sleep(0.5)
+        lesson_detail = lesson_details.get(lesson_id)
+        if not lesson_detail:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Lesson not found",
+                    "message": f"No lesson found with id: {lesson_id}"
+                }
+            )
+        return lesson_detail
+
+    @app.get("/api/stats/stt")
+    def get_stt_stats():
+        """CPU use and audio accounting for recent recognition streams."""
+        return stt.recent_stats()
+
+    @app.post("/text")
+    def text_endpoint(request: AskRequest):
+        """Handles text input, returns JSON only (no TTS)."""
+        lesson_context = get_lesson_context(request.lesson_id, request.lesson_section_id)
+        language = define_language(request.language)
+        response = ask(llm, request.userPrompt, lesson_context, language, GENERATION_BUDGETS["text"])
+        return {"input": request.userPrompt, "response": response}
+
+    @app.post("/voice")
+    def voice_endpoint(request: VoiceRequest):
+        """Handles voice input, speaks aloud and returns JSON."""
+        spoken_text = stt.listen()
+        if not spoken_text:
+            return {"response": "No speech detected."}
+
+        language = define_language(request.language)
+        lesson_context = get_lesson_context(request.lesson_id, request.lesson_section_id)
+        response = ask(llm, spoken_text, lesson_context, language, GENERATION_BUDGETS["voice"])
+
+        # Tiny pause can help avoid device contention on some backends
+        time.sleep(0.05)
+        tts.speak(response)
+        return {"input": spoken_text, "response": response}
+
+    @app.post("/shortcut")
+    def shortcut_endpoint(request: ShortcutRequest):
+        """Handles voice input to either ask questions or move between lessons.
+        Only requires lesson_id to determine current context.
+        """
+        spoken_text = stt.listen()
+        if not spoken_text:
+            return {"response": "No speech detected.", "lesson_id": "", "action": ShortcutAction.ASK.value}
+
+        lesson_context = get_navigation_context(request.lesson_id)
+        language = define_language(request.language)
+        return ask_anywhere(llm, spoken_text, lesson_context, language)
+
+    return app
@@ -0,0 +1,57 @@
+from typing import Any, Optional
+
+from .dummy_data import lessons
+from .generation import GENERATION_BUDGETS, GenerationBudget
+from .llm import LLMBackend
+from .models import ShortcutAction
+
+
+# -------------------- System prompt --------------------
+system_prompt = (
+    "You are an AI teaching assistant for classrooms. "
+    "Answer clearly, step by step, using simple examples. "
+    "Contextualize answers to the current lesson."
+    "Support the teacher, never reference the internet. "
+    "Use natural cadence, short sentences, occasional pauses, and friendly tone(max 50 words)."
+    "Understand that you are part of a teaching tool, and your goal is to assist learning."
+)
+
+NAVIGATION_WORDS = ["go to", "move to", "navigate", "switch to"]
+
+# -------------------- Prompts --------------------
+def ask(llm: LLMBackend, prompt: str, lesson_context: Optional[Any], language: str,
+        budget: GenerationBudget = GENERATION_BUDGETS["text"]) -> str:
+    final_prompt = f"""
+    {system_prompt}
+    
+    This is the lesson context: {lesson_context}
+    
+    This is the user prompt: {prompt}
+    respond only in the language: {language}
+    """
+    return llm.generate(final_prompt, budget)
+
+def ask_anywhere(llm: LLMBackend, prompt: str, lesson_context: Optional[Any], language: str) -> dict:
+    # This works from any page and can also move between lessons.
+    nav_prompt = system_prompt + "\n\nYou can help users navigate lessons or answer questions. If they want to move to a different lesson, respond with the lesson ID. Available lessons: " + str([{"id": lesson["id"], "title": lesson["title"]} for lesson in lessons])
+
+    final_prompt = f"{nav_prompt}\n\nThis is the lesson context: {lesson_context}\n\nThis is the user prompt: {prompt}\nrespond only in the language: {language}"
+    response = llm.generate(final_prompt, GENERATION_BUDGETS["shortcut"])
+
+    # Check if response indicates navigation
+    lower_response = response.lower()
+    if any(nav_word in lower_response for nav_word in NAVIGATION_WORDS):
+        for lesson in lessons:
+            if lesson["title"].lower() in lower_response:
+                return {
+                    "response": response,
+                    "lesson_id": lesson["id"],
+                    "action": ShortcutAction.MOVE.value
+                }
+
+    # Default to ASK action if no navigation detected
+    return {
+        "response": response,
+        "lesson_id": "",
+        "action": ShortcutAction.ASK.value
+    }
@@ -0,0 +1,261 @@
+"""Audio frame pipeline for the STT backends.
+
+Frames are int16 numpy views over preallocated buffers, so the hot loop does
+not allocate per chunk: the microphone callback copies into a fixed ring,
+RMS/VAD runs vectorized on the view, and the recognizer reads the same memory.
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+
+# -------------------- Stream stats --------------------
+class StreamStats(BaseModel):
+    """CPU and audio accounting for one recognition stream."""
+    frames: int = 0
+    speech_frames: int = 0
+    skipped_frames: int = 0       # silence not sent to the recognizer
+    dropped_frames: int = 0
+    partial_parses: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0      # CPU time of the thread running the recognizer
+    cpu_percent: float = 0.0      # of one core, over the stream's wall time
+    realtime_factor: float = 0.0  # CPU seconds per second of audio; 1/rtf streams fit on a core
+
+
+# -------------------- Frame sources --------------------
+class MicrophoneSource:
+    """Captures the default microphone into a preallocated ring of int16 frames.
+
+    ``read`` returns a view into the ring that stays valid until the ring wraps
+    around, i.e. for ``slots - 1`` further frames.
+    """
+
+    def __init__(self, rate: int, frames_per_buffer: int, slots: int = 32):
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.slots = slots
+        self.ring = np.zeros((slots, frames_per_buffer), dtype=np.int16)
+        self.dropped = 0
+        self._written = 0
+        self._read = 0
+        self._ready = threading.Semaphore(0)
+        self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status and status.input_overflow:
+            # PortAudio discarded input before this block reached us
+            self.dropped += 1
+        np.copyto(self.ring[self._written % self.slots], np.frombuffer(indata, dtype=np.int16))
+        self._written += 1
+        self._ready.release()
+
+    def __enter__(self) -> "MicrophoneSource":
+        import sounddevice as sd
+
+        self._stream = sd.RawInputStream(
+            samplerate=self.rate,
+            blocksize=self.frames_per_buffer,
+            dtype="int16",
+            channels=1,
+            callback=self._callback,
+        )
+        self._stream.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stream.stop()
+        self._stream.close()
+
+    def read(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        while True:
+            if not self._ready.acquire(timeout=timeout):
+                return None
+            if self._read >= self._written:
+                continue  # permit left over from skipping ahead
+            if self._written - self._read > self.slots - 1:
+                # Consumer fell behind and the ring wrapped: skip to the oldest intact frame
+                skipped = self._written - (self.slots - 1) - self._read
+                self.dropped += skipped
+                self._read += skipped
+            frame = self.ring[self._read % self.slots]
+            self._read += 1
+            return frame
+
+
+class ArraySource:
+    """Serves frames as views over an int16 array. Used for files and benchmarks."""
+
+    def __init__(self, samples: np.ndarray, frames_per_buffer: int):
+        self.samples = samples
+        self.frames_per_buffer = frames_per_buffer
+        self.dropped = 0
+        self._pos = 0
+
+    def read(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        end = self._pos + self.frames_per_buffer
+        if end > len(self.samples):
+            return None
+        frame = self.samples[self._pos:end]
+        self._pos = end
+        return frame
+
+
+# -------------------- VAD --------------------
+class EnergyVad:
+    """Energy voice activity detection with an adaptive noise floor.
+
+    The floor is the quietest frame level over the last ``window`` frames, so
+    steady background noise (fans, a busy classroom) stops counting as speech
+    once it has lasted a full window, while pauses between words keep the floor
+    low during real speech.
+    """
+
+    def __init__(self, frames_per_buffer: int, threshold: float = 300.0,
+                 ratio: float = 3.0, window: int = 12):
+        self.threshold = threshold
+        self.ratio = ratio
+        self.level = 0.0
+        self._levels = np.full(window, threshold / ratio, dtype=np.float64)
+        self._next = 0
+        self._scratch = np.empty(frames_per_buffer, dtype=np.float32)
+
+    @property
+    def noise_floor(self) -> float:
+        return float(self._levels.min())
+
+    def rms(self, frame: np.ndarray) -> float:
+        scratch = self._scratch[:len(frame)]
+        np.copyto(scratch, frame)  # int16 -> float32 without a temporary
+        return math.sqrt(float(np.dot(scratch, scratch)) / len(frame))
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        self.level = self.rms(frame)
+        self._levels[self._next] = self.level
+        self._next = (self._next + 1) % len(self._levels)
+        return self.level > max(self.threshold, self.noise_floor * self.ratio)
+
+
+# -------------------- Recognition loop --------------------
+def _waveform_acceptor(recognizer):
+    """Feed int16 frames to Vosk without copying them into bytes when possible.
+
+    The zero-copy path uses vosk internals (``_c``, ``_ffi`` and the
+    recognizer's ``_handle``); if any of them is missing, frames go through the
+    public ``AcceptWaveform`` as bytes instead.
+    """
+    try:
+        from vosk import _c, _ffi
+        handle = recognizer._handle
+        accept_waveform = _c.vosk_recognizer_accept_waveform
+        from_buffer = _ffi.from_buffer
+    except (ImportError, AttributeError):
+        return lambda frame: recognizer.AcceptWaveform(frame.tobytes())
+
+    def accept(frame: np.ndarray) -> bool:
+        res = accept_waveform(handle, from_buffer(frame), frame.nbytes)
+        if res < 0:
+            raise Exception("Failed to process waveform")
+        return bool(res)
+
+    return accept
+
+
+def recognize(recognizer, source, rate: int, vad: Optional[EnergyVad] = None,
+              timeout: float = 5.0, phrase_time_limit: float = 5.0,
+              partial_interval: float = 0.3,
+              silence_hangover: float = 2.0) -> Tuple[str, StreamStats]:
+    """Run recognizer over frames from source until an utterance ends.
+
+    Time is tracked in samples rather than wall clock, and the partial result is
+    only parsed every ``partial_interval`` seconds of audio. Listening is
+    extended by Vosk results and partials only.
+
+    With a ``vad``, frames are not sent to the recognizer once the VAD has heard
+    no speech for ``silence_hangover`` seconds, which is long enough for Vosk's
+    own endpointing to finish an utterance. Decoding silence is most of the CPU
+    an idle stream costs. The last skipped frame is fed again when speech
+    resumes so soft onsets are not lost. Without a VAD every frame is decoded.
+    """
+    stats = StreamStats()
+    accept = _waveform_acceptor(recognizer)
+
+    max_samples = int((timeout + phrase_time_limit) * rate)
+    silence_limit = int(phrase_time_limit * rate)
+    partial_step = max(1, int(partial_interval * rate))
+    hangover = int(silence_hangover * rate)
+
+    heard = 0
+    last_voice = 0
+    last_speech = 0
+    next_partial = partial_step
+    has_partial = False
+    skipped = None
+    text_out = ""
+
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        while heard < max_samples:
+            frame = source.read()
+            if frame is None:
+                break
+            heard += len(frame)
+            stats.frames += 1
+
+            pending = (frame,)
+            if vad is not None:
+                if vad.is_speech(frame):
+                    stats.speech_frames += 1
+                    last_speech = heard
+                    if skipped is not None:
+                        pending = (skipped, frame)
+                        skipped = None
+                elif heard - last_speech > hangover:
+                    if has_partial:
+                        break  # Vosk did not endpoint during the hangover; finish now
+                    skipped = frame
+                    stats.skipped_frames += 1
+                    if heard - last_voice > silence_limit:
+                        break
+                    continue
+
+            for chunk in pending:
+                if accept(chunk):
+                    text_out = json.loads(recognizer.Result()).get("text", "")
+                    has_partial = False
+                    if text_out:
+                        break
+                    last_voice = heard
+            if text_out:
+                break
+            if heard >= next_partial:
+                next_partial = heard + partial_step
+                stats.partial_parses += 1
+                has_partial = bool(json.loads(recognizer.PartialResult()).get("partial", ""))
+                if has_partial:
+                    last_voice = heard
+
+            if heard - last_voice > silence_limit:
+                break
+
+        if not text_out:
+            text_out = json.loads(recognizer.FinalResult()).get("text", "")
+    finally:
+        stats.cpu_seconds = time.thread_time() - cpu_start
+        stats.wall_seconds = time.perf_counter() - wall_start
+        stats.audio_seconds = heard / rate
+        stats.dropped_frames = source.dropped
+        if stats.wall_seconds > 0:
+            stats.cpu_percent = 100.0 * stats.cpu_seconds / stats.wall_seconds
+        if stats.audio_seconds > 0:
+            stats.realtime_factor = stats.cpu_seconds / stats.audio_seconds
+
+    return text_out, stats
@@ -0,0 +1,161 @@
+"""Shared performance benchmarks for the Teachi backends.
+
+Runs against the same backend interfaces the app uses, so a speed-up in any
+STT/TTS/LLM implementation shows up here regardless of which entry point
+serves it. Backends are selected exactly like the app (``TEACHI_*`` env vars).
+
+    cd backend
+    python -m teachi.benchmarks                 # everything
+    python -m teachi.benchmarks --only trim,llm --runs 10
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from .assistant import ask
+from .audio import ArraySource, EnergyVad
+from .config import Settings
+from .dummy_data import lesson_details
+from .generation import GENERATION_BUDGETS, trim_to_budget
+from .llm import create_llm
+from .stt import VoskSTT, create_stt
+from .tts import create_tts
+
+SAMPLE_PROMPTS = [
+    "Why do clouds form?",
+    "Explain evaporation to a ten year old.",
+    "What happens to rain after it falls?",
+]
+
+SAMPLE_CONTEXT = lesson_details["water-cycle"]["sections"][0]["content"]
+
+
+def _report(name: str, timings: List[float], extra: str = ""):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+    print(
+        f"{name:<28} n={len(timings):<5} "
+        f"mean={statistics.mean(timings) * 1000:9.2f}ms "
+        f"p50={statistics.median(timings) * 1000:9.2f}ms "
+        f"p95={p95 * 1000:9.2f}ms {extra}"
+    )
+
+
+def _time(fn: Callable[[], object], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+# -------------------- Benchmarks --------------------
+def bench_trim(settings: Settings, runs: int):
+    """Cost of the budget check that runs on every streamed token."""
+    budget = GENERATION_BUDGETS["voice"]
+    tokens = ("The sun heats water in oceans and lakes. It rises as vapour. " * 20).split(" ")
+
+    def stream():
+        text = ""
+        for token in tokens:
+            text += token + " "
+            _, done = trim_to_budget(text, budget)
+            if done:
+                break
+
+    _report("trim_to_budget/stream", _time(stream, max(runs, 100)))
+
+
+def bench_llm(settings: Settings, runs: int):
+    """End-to-end answer latency per endpoint budget."""
+    llm = create_llm(settings)
+    for endpoint, budget in GENERATION_BUDGETS.items():
+        words: List[int] = []
+
+        def one():
+            prompt = SAMPLE_PROMPTS[len(words) % len(SAMPLE_PROMPTS)]
+            words.append(len(ask(llm, prompt, SAMPLE_CONTEXT, "English", budget).split()))
+
+        timings = _time(one, runs)
+        _report(f"llm[{settings.llm_backend}]/{endpoint}", timings,
+                f"words={statistics.mean(words):.0f} (max {budget.max_words})")
+
+
+def bench_stt(settings: Settings, runs: int):
+    """Startup cost of the STT backend (model load)."""
+    _report(f"stt[{settings.stt_backend}]/load", _time(lambda: create_stt(settings), runs))
+
+
+def _synthetic_speech(seconds: float, rate: int = 16000) -> np.ndarray:
+    """Background noise with half-second tone bursts, as int16 samples."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    signal = 200 * rng.standard_normal(len(t))
+    signal += 4000 * np.sin(2 * np.pi * 220 * t) * ((t % 1.0) < 0.5)
+    return signal.astype(np.int16)
+
+
+def bench_audio(settings: Settings, runs: int):
+    """Per-frame VAD cost and CPU per recognition stream."""
+    frames = settings.stt_frames_per_buffer
+    samples = _synthetic_speech(10.0)
+
+    vad = EnergyVad(frames, threshold=settings.stt_vad_threshold)
+    frame = samples[:frames]
+    _report("audio/vad", _time(lambda: vad.is_speech(frame), max(runs, 1000)))
+
+    if settings.stt_backend != "vosk":
+        return
+    stt = create_stt(settings)
+    assert isinstance(stt, VoskSTT)
+    seconds = len(samples) / stt.rate
+    timings = _time(lambda: stt.transcribe(ArraySource(samples, frames), seconds, seconds), runs)
+    stats = stt.recent_stats()
+    cpu = statistics.mean(s.cpu_seconds for s in stats)
+    rtf = statistics.mean(s.realtime_factor for s in stats)
+    _report("audio/vosk-stream", timings,
+            f"cpu={cpu:.2f}s/{seconds:.0f}s audio rtf={rtf:.3f} (~{1 / rtf if rtf else 0:.0f} live streams/core)")
+
+
+def bench_tts(settings: Settings, runs: int):
+    """How long speak() blocks the request thread. Should be near zero."""
+    tts = create_tts(settings)
+    try:
+        _report(f"tts[{settings.tts_backend}]/speak", _time(lambda: tts.speak("Benchmark."), runs))
+    finally:
+        tts.close()
+
+
+BENCHMARKS: Dict[str, Callable[[Settings, int], None]] = {
+    "trim": bench_trim,
+    "llm": bench_llm,
+    "stt": bench_stt,
+    "audio": bench_audio,
+    "tts": bench_tts,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma-separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    settings = Settings.from_env()
+    for name in args.only.split(","):
+        name = name.strip()
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+        try:
+            BENCHMARKS[name](settings, args.runs)
+        except Exception as e:
+            print(f"{name:<28} skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [item.strip() for item in os.environ.get(name, default).split(",") if item.strip()]
+
+
+# -------------------- Settings --------------------
+class Settings(BaseModel):
+    """Backend selection and tuning. Every field can be set from the environment."""
+
+    stt_backend: str = "vosk"       # vosk | google
+    tts_backend: str = "pyttsx3"    # pyttsx3 | gtts | none
+    llm_backend: str = "ollama"     # ollama
+
+    vosk_model: str = "vosk-model-small-en-us-0.15"
+    vosk_model_path: Optional[str] = None  # explicit path; otherwise resolved from the model cache
+    cache_dir: Optional[str] = None  # defaults to TEACHI_MODEL_CACHE or ~/.cache/teachi/models
+    stt_frames_per_buffer: int = 4096
+    stt_partial_interval: float = 0.3   # seconds of audio between partial-result parses
+    stt_vad_threshold: float = 300.0    # minimum int16 RMS counted as speech
+    stt_silence_hangover: float = 2.0   # seconds of silence before frames skip the decoder; 0 disables the VAD
+    ollama_url: str = "http://localhost:11434"
+    ollama_model: str = "qwen2.5:7b"
+    tts_rate: int = 172
+
+    cors_origins: List[str] = ["http://localhost:3000"]
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        defaults = cls()
+        return cls(
+            stt_backend=os.environ.get("TEACHI_STT", defaults.stt_backend),
+            tts_backend=os.environ.get("TEACHI_TTS", defaults.tts_backend),
+            llm_backend=os.environ.get("TEACHI_LLM", defaults.llm_backend),
+            vosk_model=os.environ.get("VOSK_MODEL", defaults.vosk_model),
+            vosk_model_path=os.environ.get("VOSK_MODEL_PATH", defaults.vosk_model_path),
+            cache_dir=os.environ.get("TEACHI_MODEL_CACHE", defaults.cache_dir),
+            stt_frames_per_buffer=int(os.environ.get("TEACHI_STT_FRAMES", defaults.stt_frames_per_buffer)),
+            stt_partial_interval=float(os.environ.get("TEACHI_STT_PARTIAL_INTERVAL", defaults.stt_partial_interval)),
+            stt_vad_threshold=float(os.environ.get("TEACHI_STT_VAD_THRESHOLD", defaults.stt_vad_threshold)),
+            stt_silence_hangover=float(os.environ.get("TEACHI_STT_SILENCE_HANGOVER", defaults.stt_silence_hangover)),
+            ollama_url=os.environ.get("OLLAMA_URL", defaults.ollama_url),
+            ollama_model=os.environ.get("OLLAMA_MODEL", defaults.ollama_model),
+            tts_rate=int(os.environ.get("TEACHI_TTS_RATE", defaults.tts_rate)),
+            cors_origins=_env_list("TEACHI_CORS_ORIGINS", ",".join(defaults.cors_origins)),
+        )
@@ -0,0 +1,63 @@
+import bisect
+import re
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+# -------------------- Generation budgets --------------------
+# The system prompt asks for max 50 words; these limits enforce it server-side
+# so latency stays bounded no matter which LLM backend is used.
+STOP_SEQUENCES = ["\n\n\n", "This is the user prompt:", "This is the lesson context:"]
+
+class GenerationBudget(BaseModel):
+    num_predict: int      # hard token cap passed to the model
+    max_words: int        # streamed output is cut once this many words arrive
+    max_sentences: int    # ...or once this many complete sentences arrive
+    deadline: float       # wall-clock seconds before returning the partial answer
+
+GENERATION_BUDGETS: Dict[str, GenerationBudget] = {
+    "text": GenerationBudget(num_predict=96, max_words=50, max_sentences=6, deadline=12.0),
+    "voice": GenerationBudget(num_predict=96, max_words=50, max_sentences=4, deadline=6.0),
+    "shortcut": GenerationBudget(num_predict=96, max_words=50, max_sentences=4, deadline=6.0),
+}
+
+FALLBACK_RESPONSE = "Sorry, I could not answer in time. Please try again."
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+_WORD = re.compile(r"\S+")
+
+def trim_to_budget(text: str, budget: GenerationBudget, final: bool = False) -> tuple:
+    """Return (text, done). done is True once the word or sentence budget is met.
+
+    Prefers cutting at the last complete sentence inside the word budget so the
+    spoken answer does not stop mid-sentence.
+    """
+    # A terminator or word at the very end only counts once the stream is
+    # finished: tokens arrive as sub-words, so it may still be growing.
+    ends = [m.end() for m in _SENTENCE_END.finditer(text + (" " if final else ""))]
+
+    if len(ends) >= budget.max_sentences:
+        return text[:ends[budget.max_sentences - 1]].strip(), True
+
+    words = [m.end() for m in _WORD.finditer(text) if final or m.end() < len(text)]
+    if len(words) >= budget.max_words:
+        cut = words[budget.max_words - 1]
+        # Back up to a sentence end only if it keeps at least half the budget;
+        # otherwise "Sure! <long run-on>" would collapse to "Sure!".
+        inside = [e for e in ends if e <= cut and 2 * bisect.bisect_right(words, e) >= budget.max_words]
+        if inside:
+            cut = inside[-1]
+        return text[:cut].strip(), True
+
+    return text.strip(), False
+
+
+_PARTIAL_WORD = re.compile(r"\S*[^\s.!?,;:]$")
+
+def drop_partial_word(text: str) -> str:
+    """Drop a trailing word that may have been cut off mid-token.
+
+    A word followed by whitespace or ending in punctuation is kept.
+    """
+    return _PARTIAL_WORD.sub("", text).rstrip()
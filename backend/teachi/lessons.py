@@ -0,0 +1,27 @@
+from typing import Any, Optional
+
+from .dummy_data import lessons, lesson_details
+
+
+def get_lesson_context(lesson_id: str, lesson_section_id: str) -> Optional[Any]:
+    lesson = lesson_details.get(lesson_id)
+    if not lesson:
+        return None
+    for section in lesson["sections"]:
+        if section["id"] == lesson_section_id:
+            return section["content"]
+    return None
+
+def get_navigation_context(lesson_id: str) -> Optional[Any]:
+    """The first section of the current lesson, used as context for /shortcut."""
+    if lesson_id and lesson_id in lesson_details:
+        return lesson_details[lesson_id]["sections"][0]["content"]
+    return None
+
+def define_language(language: str) -> str:
+    if language == "en":
+        return "English"
+    elif language == "es":
+        return "Spanish"
+    else:
+        return "English"
@@ -0,0 +1,131 @@
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from typing import Dict, Type
+
+from .config import Settings
+from .generation import FALLBACK_RESPONSE, STOP_SEQUENCES, GenerationBudget, drop_partial_word, trim_to_budget
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(Exception):
+    """The LLM backend failed for a reason other than running out of time."""
+
+
+def _is_timeout(e: BaseException) -> bool:
+    if isinstance(e, urllib.error.URLError) and not isinstance(e, urllib.error.HTTPError):
+        e = e.reason
+    return isinstance(e, (socket.timeout, TimeoutError))
+
+
+# -------------------- LLM backends --------------------
+class LLMBackend(ABC):
+    @abstractmethod
+    def generate(self, prompt: str, budget: GenerationBudget) -> str:
+        """Return the completion for prompt, bounded by budget. Raises LLMError on failure."""
+
+
+class OllamaLLM(LLMBackend):
+    """Streams from the Ollama HTTP API, stopping as soon as the budget is met."""
+
+    def __init__(self, settings: Settings):
+        self.url = f"{settings.ollama_url}/api/generate"
+        self.model = settings.ollama_model
+
+    @staticmethod
+    def _stream(req: urllib.request.Request, timeout: float, lines: queue.Queue, stop: threading.Event):
+        """Push response lines onto lines, then None. Errors are pushed as exceptions."""
+        try:
+            # Closing the response early tells Ollama to stop generating.
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                for line in resp:
+                    if stop.is_set():
+                        break
+                    lines.put(line)
+        except Exception as e:
+            lines.put(e)
+        lines.put(None)
+
+    def generate(self, prompt: str, budget: GenerationBudget) -> str:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {"num_predict": budget.num_predict, "stop": STOP_SEQUENCES},
+        }
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+
+        # The socket timeout only bounds each read, so the request runs in a
+        # worker thread and the deadline is enforced here on the queue.
+        lines: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        threading.Thread(target=self._stream, args=(req, budget.deadline, lines, stop), daemon=True).start()
+
+        deadline = time.monotonic() + budget.deadline
+        text = ""
+        finished = done = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    line = lines.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if line is None:
+                    break
+                if isinstance(line, Exception):
+                    raise line
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise LLMError(f"Ollama error: {chunk['error']}")
+                text += chunk.get("response", "")
+                finished = chunk.get("done", False)
+                trimmed, done = trim_to_budget(text, budget, final=finished)
+                if done:
+                    text = trimmed
+                if done or finished:
+                    break
+        except Exception as e:
+            if not _is_timeout(e):
+                logger.exception("Ollama request to %s failed", self.url)
+                if isinstance(e, LLMError):
+                    raise
+                raise LLMError(f"Ollama request failed: {e}") from e
+            # Timed out: fall through with whatever arrived.
+        finally:
+            stop.set()
+
+        if not done:
+            if not finished:
+                # Cut off by the deadline: the last token may be half a word.
+                text = drop_partial_word(text)
+            text, _ = trim_to_budget(text, budget, final=True)
+        return text or FALLBACK_RESPONSE
+
+
+LLM_BACKENDS: Dict[str, Type[LLMBackend]] = {
+    "ollama": OllamaLLM,
+}
+
+def create_llm(settings: Settings) -> LLMBackend:
+    try:
+        backend = LLM_BACKENDS[settings.llm_backend]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend: {settings.llm_backend!r} (choose from {sorted(LLM_BACKENDS)})")
+    return backend(settings)
@@ -0,0 +1,54 @@
+from enum import Enum
+from typing import Any, List
+
+from pydantic import BaseModel
+
+
+# -------------------- Request / response models --------------------
+class AskRequest(BaseModel):
+    lesson_id: str
+    lesson_section_id: str
+    lessons_step: str
+    userPrompt: str
+    language: str = "en"
+
+class VoiceRequest(BaseModel):
+    lesson_id: str
+    lesson_section_id: str
+    lessons_step: str
+    language: str = "en"
+
+class ShortcutRequest(BaseModel):
+    lesson_id: str
+    language: str = "en"
+
+class MoveToLesson(BaseModel):
+    lesson_id: str
+
+class ShortcutAction(Enum):
+    ASK = "ask"
+    MOVE = "move"
+
+class ShortcutResponse(BaseModel):
+    response: str
+    lesson_id: str
+    action: ShortcutAction
+
+class Lesson(BaseModel):
+    id: str
+    title: str
+    summary: str
+
+class LessonStep(BaseModel):
+    step: str
+    description: str
+
+class LessonSection(BaseModel):
+    id: str
+    title: str
+    content: Any  # Can be string or List[LessonStep]
+
+class LessonDetail(BaseModel):
+    id: str
+    title: str
+    sections: List[LessonSection]
@@ -0,0 +1,383 @@
+"""Model provisioning: resumable downloads, SHA-256 checks and a shared model cache.
+
+The expected digest comes from ``--sha256``, the pinned ``ModelSpec.sha256``,
+or a ``<archive>.sha256`` file next to the archive (on the mirror or beside a
+local file), in that order. Without one the archive is installed unverified
+and a warning is printed.
+
+Models live in a versioned cache shared by every checkout on the machine::
+
+    <cache>/vosk/vosk-model-small-en-us-0.15/     extracted model
+    <cache>/vosk/vosk-model-small-en-us-0.15/.teachi-model.json   completion marker
+    <cache>/downloads/vosk-model-small-en-us-0.15.zip.part        resumable download
+    <cache>/locks/vosk-vosk-model-small-en-us-0.15.lock          held while provisioning
+
+A model directory only ever appears under its final name after it has been
+verified and fully extracted, so an interrupted run can never leave a model
+that breaks startup.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import shutil
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+MARKER = ".teachi-model.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+class ModelSpec(BaseModel):
+    name: str                      # also the versioned cache directory name
+    kind: str = "vosk"
+    url: str
+    sha256: Optional[str] = None   # pinned digest; otherwise read from '<archive>.sha256' if present
+    required_files: Tuple[str, ...] = ("am/final.mdl", "conf/model.conf")
+
+
+MODELS: Dict[str, ModelSpec] = {
+    "vosk-model-small-en-us-0.15": ModelSpec(
+        name="vosk-model-small-en-us-0.15",
+        url="https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip",
+    ),
+}
+
+
+class ProvisioningError(Exception):
+    pass
+
+
+def default_cache_dir() -> str:
+    if os.environ.get("TEACHI_MODEL_CACHE"):
+        return os.environ["TEACHI_MODEL_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "teachi", "models")
+
+
+def model_dir(spec: ModelSpec, cache_dir: str) -> str:
+    return os.path.join(cache_dir, spec.kind, spec.name)
+
+
+def is_complete(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MARKER))
+
+
+def missing_files(spec: ModelSpec, path: str) -> List[str]:
+    return [f for f in spec.required_files if not os.path.isfile(os.path.join(path, f))]
+
+
+def read_marker(path: str) -> dict:
+    try:
+        with open(os.path.join(path, MARKER)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# -------------------- Downloading --------------------
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_local(source: str) -> bool:
+    return urllib.parse.urlparse(source).scheme in ("", "file") or os.path.exists(source)
+
+
+def _local_path(source: str) -> str:
+    parsed = urllib.parse.urlparse(source)
+    if parsed.scheme == "file":
+        return urllib.request.url2pathname(parsed.path)
+    return source
+
+
+def source_for(spec: ModelSpec, mirror: Optional[str] = None) -> str:
+    """The archive location, optionally redirected to a mirror URL or directory."""
+    if not mirror:
+        return spec.url
+    filename = os.path.basename(urllib.parse.urlparse(spec.url).path)
+    if _is_local(mirror):
+        return os.path.join(_local_path(mirror), filename)
+    return mirror.rstrip("/") + "/" + filename
+
+
+def _content_range_total(headers) -> Optional[int]:
+    """Total size from a 'Content-Range: bytes a-b/total' (or 'bytes */total') header."""
+    value = headers.get("Content-Range", "")
+    total = value.rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def download(url: str, dest: str) -> str:
+    """Download url to dest, resuming from dest + '.part' if a previous run stopped.
+
+    The .part file is only promoted to dest once its size matches what the
+    server announced; a short read leaves it in place for the next run.
+    """
+    part = dest + ".part"
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+
+    req = urllib.request.Request(url)
+    if offset:
+        req.add_header("Range", f"bytes={offset}-")
+    try:
+        resp = urllib.request.urlopen(req, timeout=60)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # 416: nothing left after offset. Only trust that if the sizes agree.
+        if _content_range_total(e.headers) == offset:
+            os.replace(part, dest)
+            return dest
+        print("Partial download does not match the server copy, starting over.")
+        os.remove(part)
+        return download(url, dest)
+
+    with resp:
+        if offset and resp.status != 206:
+            print("Server does not support resume, starting over.")
+            offset = 0
+        if resp.status == 206:
+            total = _content_range_total(resp.headers)
+        else:
+            length = resp.headers.get("Content-Length")
+            total = int(length) if length else None
+        if offset:
+            print(f"Resuming at {offset / 2**20:.1f} MB")
+        done = offset
+        try:
+            with open(part, "ab" if offset else "wb") as f:
+                for chunk in iter(lambda: resp.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    done += len(chunk)
+                    if total:
+                        print(f"\r{done // 2**20}/{total // 2**20} MB", end="", flush=True)
+        except http.client.HTTPException as e:
+            raise ProvisioningError(f"Download interrupted ({e}); re-run to resume") from e
+        finally:
+            if total:
+                print()
+
+    if total is not None and done != total:
+        raise ProvisioningError(
+            f"Download interrupted at {done} of {total} bytes; re-run to resume"
+        )
+    os.replace(part, dest)
+    return dest
+
+
+def fetch_checksum(source: str) -> Optional[str]:
+    """Digest from a '<archive>.sha256' file next to the archive, if there is one.
+
+    Accepts the ``sha256sum`` format (digest first, optional file name after).
+    """
+    try:
+        if _is_local(source):
+            path = _local_path(source) + ".sha256"
+            if not os.path.isfile(path):
+                return None
+            with open(path) as f:
+                text = f.read(4096)
+        else:
+            with urllib.request.urlopen(source + ".sha256", timeout=30) as resp:
+                text = resp.read(4096).decode("ascii", "replace")
+    except OSError:  # includes HTTP 404 and other URLErrors
+        return None
+    fields = text.split()
+    digest = fields[0].lower() if fields else ""
+    if not re.fullmatch(r"[0-9a-f]{64}", digest):
+        raise ProvisioningError(f"Malformed checksum file for {source}")
+    return digest
+
+
+def fetch_archive(spec: ModelSpec, cache_dir: str, source: str) -> str:
+    """Return a local path to the model archive, downloading it if needed."""
+    if _is_local(source):
+        path = _local_path(source)
+        if not os.path.isfile(path):
+            raise ProvisioningError(f"Archive not found: {path}")
+        return path
+    dest = os.path.join(cache_dir, "downloads", os.path.basename(urllib.parse.urlparse(source).path))
+    if os.path.exists(dest):
+        return dest
+    print(f"Downloading {source}")
+    return download(source, dest)
+
+
+# -------------------- Extraction --------------------
+def _extract(archive: str, target: str) -> None:
+    """Extract archive into target, refusing entries that escape it."""
+    root = os.path.realpath(target)
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            for member in zf.namelist():
+                dest = os.path.realpath(os.path.join(root, member))
+                if dest != root and not dest.startswith(root + os.sep):
+                    raise ProvisioningError(f"Unsafe path in archive: {member}")
+            zf.extractall(root)
+    except (zipfile.BadZipFile, EOFError, zlib.error) as e:
+        raise ProvisioningError(f"Corrupt archive {archive}: {e}") from e
+
+
+def install_archive(spec: ModelSpec, archive: str, cache_dir: str, digest: str, source: str,
+                    replace: bool = False) -> str:
+    """Extract archive into the cache and publish it under its final name atomically.
+
+    An existing incomplete directory is always replaced; a complete one only
+    when ``replace`` is set.
+    """
+    final = model_dir(spec, cache_dir)
+    parent = os.path.dirname(final)
+    os.makedirs(parent, exist_ok=True)
+    staging = os.path.join(parent, f".tmp-{spec.name}-{os.getpid()}")
+    old = os.path.join(parent, f".old-{spec.name}-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    try:
+        _extract(archive, staging)
+        # Archives usually wrap the model in a single top-level directory
+        entries = os.listdir(staging)
+        content = staging
+        if len(entries) == 1 and os.path.isdir(os.path.join(staging, entries[0])):
+            content = os.path.join(staging, entries[0])
+        missing = missing_files(spec, content)
+        if missing:
+            raise ProvisioningError(f"Archive {archive} is not a complete model, missing: {', '.join(missing)}")
+        with open(os.path.join(content, MARKER), "w") as f:
+            json.dump({"name": spec.name, "sha256": digest, "source": source}, f)
+
+        if os.path.exists(final) and (replace or not is_complete(final)):
+            # Move the old copy aside rather than deleting it in place
+            os.rename(final, old)
+        try:
+            os.rename(content, final)
+        except OSError:
+            if not is_complete(final):
+                raise
+            # Another process published the same model first; keep theirs
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(old, ignore_errors=True)
+    return final
+
+
+# -------------------- Entry points --------------------
+@contextmanager
+def _locked(path: str):
+    """Hold an exclusive OS lock on path. Released automatically if the process dies."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10s, then raises
+                    break
+                except OSError:
+                    print("Waiting for another provisioner...")
+        else:
+            import fcntl
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                print("Waiting for another provisioner...")
+                fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def provision(name: str, cache_dir: Optional[str] = None, source: Optional[str] = None,
+              mirror: Optional[str] = None, sha256: Optional[str] = None) -> str:
+    """Make sure model name is in the cache and return its directory."""
+    if name not in MODELS:
+        raise ProvisioningError(f"Unknown model: {name!r} (choose from {sorted(MODELS)})")
+    spec = MODELS[name]
+    cache_dir = cache_dir or default_cache_dir()
+    pinned = (sha256 or spec.sha256 or "").lower() or None
+
+    # Concurrent provisioners would share the same .part file; take turns.
+    with _locked(os.path.join(cache_dir, "locks", f"{spec.kind}-{spec.name}.lock")):
+        return _provision(spec, cache_dir, source, mirror, pinned)
+
+
+def _provision(spec: ModelSpec, cache_dir: str, source: Optional[str],
+               mirror: Optional[str], pinned: Optional[str]) -> str:
+    name = spec.name
+    final = model_dir(spec, cache_dir)
+    replace = False
+    if is_complete(final):
+        installed = read_marker(final).get("sha256")
+        if not pinned or installed == pinned:
+            print(f"Model {name} already provisioned at {final}")
+            return final
+        print(f"Installed {name} has sha256={installed}, expected {pinned}; reinstalling.")
+        replace = True
+
+    source = source or source_for(spec, mirror)
+    expected = pinned or fetch_checksum(source)
+    archive = fetch_archive(spec, cache_dir, source)
+    # Only archives we downloaded ourselves are ours to delete
+    downloaded = archive.startswith(os.path.join(cache_dir, "downloads"))
+
+    print("Verifying SHA-256...")
+    digest = sha256_file(archive)
+    if expected and digest != expected:
+        if downloaded:
+            os.remove(archive)  # corrupt download; the next run starts clean
+        raise ProvisioningError(f"Checksum mismatch for {archive}: expected {expected}, got {digest}")
+    if not expected:
+        print(f"WARNING: no checksum for {name} (pass --sha256 or put a .sha256 file next to the archive); "
+              f"not verified, recorded sha256={digest}")
+
+    print("Extracting model...")
+    try:
+        final = install_archive(spec, archive, cache_dir, digest, source, replace)
+    except ProvisioningError:
+        if downloaded:
+            os.remove(archive)
+        raise
+    if downloaded:
+        os.remove(archive)
+    print(f"Installed {name} at {final}")
+    return final
+
+
+def resolve_model(name: str, cache_dir: Optional[str] = None) -> str:
+    """Find a provisioned model at startup: the shared cache first, then the working directory."""
+    cache_dir = cache_dir or default_cache_dir()
+    spec = MODELS.get(name) or ModelSpec(name=name, url="")
+    cached = model_dir(spec, cache_dir)
+    if is_complete(cached):
+        return cached
+    if os.path.isdir(name) and not missing_files(spec, name):
+        # Pre-cache installs extracted next to the app; a half-extracted one is ignored
+        return name
+    hint = ""
+    if os.path.isdir(name):
+        hint = f" ./{name} exists but is incomplete (missing {', '.join(missing_files(spec, name))}) and was ignored."
+    raise ProvisioningError(
+        f"Model {name} is not provisioned in {cache_dir}.{hint} "
+        f"Run: python download_vosk_model.py --model {name} "
+        f"(add --source path/to/{name}.zip to install from a local copy)"
+    )
@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Optional, Type
+
+from .audio import EnergyVad, MicrophoneSource, StreamStats, recognize
+from .config import Settings
+from .provisioning import resolve_model
+
+
+# -------------------- STT backends --------------------
+class STTBackend(ABC):
+    @abstractmethod
+    def listen(self, timeout: float = 5.0, phrase_time_limit: float = 5.0) -> Optional[str]:
+        """Record from the default microphone and return the transcript, or None."""
+
+    def recent_stats(self) -> List[StreamStats]:
+        """Per-stream CPU/audio stats for the most recent recognitions, oldest first."""
+        return []
+
+
+class VoskSTT(STTBackend):
+    """Offline recognition with Vosk. The model is loaded once, at startup."""
+
+    rate = 16000
+
+    def __init__(self, settings: Settings):
+        from vosk import Model as VoskModel
+
+        path = settings.vosk_model_path or resolve_model(settings.vosk_model, settings.cache_dir)
+        self.model = VoskModel(path)
+        self.frames_per_buffer = settings.stt_frames_per_buffer
+        self.partial_interval = settings.stt_partial_interval
+        self.vad_threshold = settings.stt_vad_threshold
+        self.silence_hangover = settings.stt_silence_hangover
+        self.stats: Deque[StreamStats] = deque(maxlen=50)
+
+    def transcribe(self, source, timeout: float = 5.0, phrase_time_limit: float = 5.0) -> Optional[str]:
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, self.rate)
+        recognizer.SetWords(True)
+        # The VAD only pays for itself when it lets silence skip the decoder
+        vad = None
+        if self.silence_hangover > 0:
+            vad = EnergyVad(self.frames_per_buffer, threshold=self.vad_threshold)
+
+        text_out, stats = recognize(
+            recognizer, source, self.rate, vad,
+            timeout=timeout,
+            phrase_time_limit=phrase_time_limit,
+            partial_interval=self.partial_interval,
+            silence_hangover=self.silence_hangover,
+        )
+        self.stats.append(stats)
+        return text_out if text_out else None
+
+    def listen(self, timeout: float = 5.0, phrase_time_limit: float = 5.0) -> Optional[str]:
+        with MicrophoneSource(self.rate, self.frames_per_buffer) as source:
+            return self.transcribe(source, timeout, phrase_time_limit)
+
+    def recent_stats(self) -> List[StreamStats]:
+        return list(self.stats)
+
+
+class GoogleSTT(STTBackend):
+    """Online recognition through speech_recognition's Google Web Speech API."""
+
+    def __init__(self, settings: Settings):
+        import speech_recognition as sr
+
+        self._sr = sr
+        self.recognizer = sr.Recognizer()
+
+    def listen(self, timeout: float = 5.0, phrase_time_limit: float = 5.0) -> Optional[str]:
+        try:
+            with self._sr.Microphone() as source:  # Use default microphone
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            return self.recognizer.recognize_google(audio)
+        except Exception:
+            return None
+
+
+STT_BACKENDS: Dict[str, Type[STTBackend]] = {
+    "vosk": VoskSTT,
+    "google": GoogleSTT,
+}
+
+def create_stt(settings: Settings) -> STTBackend:
+    try:
+        backend = STT_BACKENDS[settings.stt_backend]
+    except KeyError:
+        raise ValueError(f"Unknown STT backend: {settings.stt_backend!r} (choose from {sorted(STT_BACKENDS)})")
+    return backend(settings)
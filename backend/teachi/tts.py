@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from multiprocessing import Process, Queue
+from typing import Dict, Optional, Type
+
+from .config import Settings
+
+
+# -------------------- TTS backends --------------------
+class TTSBackend(ABC):
+    @abstractmethod
+    def speak(self, text: str) -> None:
+        """Queue text to be spoken. Must return without waiting for playback."""
+
+    def close(self) -> None:
+        pass
+
+
+def _pyttsx3_worker(q: Queue, rate: int):
+    # Import and init inside the child process
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)
+    voices = engine.getProperty('voices')
+    if voices:
+        engine.setProperty('voice', voices[1 if len(voices) > 1 else 0].id)
+    while True:
+        text = q.get()
+        if text is None:
+            break
+        try:
+            engine.say(text)
+            engine.runAndWait()
+        except Exception:
+            # Log if needed
+            pass
+    try:
+        engine.stop()
+    except Exception:
+        pass
+
+
+class Pyttsx3TTS(TTSBackend):
+    """Offline speech. A dedicated process owns pyttsx3 so it is never called from multiple threads."""
+
+    def __init__(self, settings: Settings):
+        self.rate = settings.tts_rate
+        self.queue: Queue = Queue()
+        self.process: Optional[Process] = None
+
+    def _start_worker(self):
+        if self.process is None or not self.process.is_alive():
+            p = Process(target=_pyttsx3_worker, args=(self.queue, self.rate), daemon=True)
+            p.start()
+            self.process = p
+
+    def speak(self, text: str) -> None:
+        self._start_worker()
+        self.queue.put(text)
+
+    def close(self) -> None:
+        try:
+            self.queue.put(None)
+        except Exception:
+            pass
+
+
+class GTTSBackend(TTSBackend):
+    """Natural-sounding online speech with gTTS, played in a background thread."""
+
+    def __init__(self, settings: Settings):
+        from gtts import gTTS
+        import playsound
+
+        self._gtts = gTTS
+        self._playsound = playsound
+
+    def _play(self, text: str):
+        fd, file = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            self._gtts(text=text, lang="en").save(file)
+            self._playsound.playsound(file)
+        finally:
+            os.remove(file)
+
+    def speak(self, text: str) -> None:
+        threading.Thread(target=self._play, args=(text,), daemon=True).start()
+
+
+class NullTTS(TTSBackend):
+    """Silent backend for headless machines and benchmarks."""
+
+    def __init__(self, settings: Settings):
+        pass
+
+    def speak(self, text: str) -> None:
+        pass
+
+
+TTS_BACKENDS: Dict[str, Type[TTSBackend]] = {
+    "pyttsx3": Pyttsx3TTS,
+    "gtts": GTTSBackend,
+    "none": NullTTS,
+}
+
+def create_tts(settings: Settings) -> TTSBackend:
+    try:
+        backend = TTS_BACKENDS[settings.tts_backend]
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend: {settings.tts_backend!r} (choose from {sorted(TTS_BACKENDS)})")
+    return backend(settings)
@@ -0,0 +1,131 @@
+from typing import List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from teachi import Settings, create_app
+from teachi.generation import GenerationBudget
+from teachi.llm import LLMBackend, LLMError, create_llm
+from teachi.stt import STTBackend, create_stt
+from teachi.tts import NullTTS, create_tts
+
+
+class FakeSTT(STTBackend):
+    def __init__(self, heard: Optional[str]):
+        self.heard = heard
+
+    def listen(self, timeout: float = 5.0, phrase_time_limit: float = 5.0) -> Optional[str]:
+        return self.heard
+
+
+class FakeLLM(LLMBackend):
+    def __init__(self, answer: str = "Clouds form when vapour cools."):
+        self.answer = answer
+        self.prompts: List[str] = []
+        self.budgets: List[GenerationBudget] = []
+
+    def generate(self, prompt: str, budget: GenerationBudget) -> str:
+        self.prompts.append(prompt)
+        self.budgets.append(budget)
+        return self.answer
+
+
+class RecordingTTS(NullTTS):
+    def __init__(self):
+        self.spoken: List[str] = []
+        self.closed = 0
+
+    def speak(self, text: str) -> None:
+        self.spoken.append(text)
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+SETTINGS = Settings(tts_backend="none")
+VOICE = {"lesson_id": "water-cycle", "lesson_section_id": "intro", "lessons_step": ""}
+
+
+def client(heard: Optional[str] = "why do clouds form", llm: Optional[LLMBackend] = None, tts=None):
+    app = create_app(SETTINGS, stt=FakeSTT(heard), tts=tts or NullTTS(SETTINGS), llm=llm or FakeLLM())
+    return TestClient(app)
+
+
+def test_text_uses_lesson_context_and_language():
+    llm = FakeLLM()
+    response = client(llm=llm).post("/text", json={**VOICE, "userPrompt": "Why?", "language": "es"})
+
+    assert response.json() == {"input": "Why?", "response": "Clouds form when vapour cools."}
+    assert "hydrologic cycle" in llm.prompts[0]
+    assert "respond only in the language: Spanish" in llm.prompts[0]
+
+
+def test_text_language_defaults_to_english():
+    llm = FakeLLM()
+    client(llm=llm).post("/text", json={**VOICE, "userPrompt": "Why?"})
+    assert "respond only in the language: English" in llm.prompts[0]
+
+
+def test_voice_speaks_answer_with_voice_budget():
+    llm, tts = FakeLLM(), RecordingTTS()
+    response = client(llm=llm, tts=tts).post("/voice", json=VOICE)
+
+    assert response.json() == {"input": "why do clouds form", "response": "Clouds form when vapour cools."}
+    assert tts.spoken == ["Clouds form when vapour cools."]
+    assert llm.budgets[0].max_words == 50
+
+
+def test_voice_without_speech():
+    assert client(heard=None).post("/voice", json=VOICE).json() == {"response": "No speech detected."}
+
+
+def test_shortcut_moves_to_named_lesson():
+    llm = FakeLLM("Sure, let's go to Friction.")
+    response = client(heard="take me to friction", llm=llm).post(
+        "/shortcut", json={"lesson_id": "water-cycle", "language": "es"})
+
+    assert response.json() == {"response": "Sure, let's go to Friction.", "lesson_id": "Friction", "action": "move"}
+    assert "respond only in the language: Spanish" in llm.prompts[0]
+
+
+def test_shortcut_answers_questions():
+    response = client().post("/shortcut", json={"lesson_id": "water-cycle"})
+    assert response.json() == {"response": "Clouds form when vapour cools.", "lesson_id": "", "action": "ask"}
+
+
+def test_shortcut_without_speech():
+    response = client(heard=None).post("/shortcut", json={"lesson_id": "", "language": "en"})
+    assert response.json() == {"response": "No speech detected.", "lesson_id": "", "action": "ask"}
+
+
+def test_llm_errors_become_503():
+    class BrokenLLM(FakeLLM):
+        def generate(self, prompt, budget):
+            raise LLMError("model not found")
+
+    response = client(llm=BrokenLLM()).post("/text", json={**VOICE, "userPrompt": "Why?"})
+    assert response.status_code == 503
+    assert response.json()["detail"]["message"] == "model not found"
+
+
+def test_lessons_endpoints():
+    c = client()
+    assert [lesson["id"] for lesson in c.get("/api/lessons").json()] == ["water-cycle", "Friction"]
+    assert c.get("/api/lessons/nope").status_code == 404
+
+
+def test_tts_closed_once_on_shutdown():
+    tts = RecordingTTS()
+    with client(tts=tts):
+        assert tts.closed == 0
+    assert tts.closed == 1
+
+
+@pytest.mark.parametrize("factory, field", [
+    (create_stt, "stt_backend"),
+    (create_tts, "tts_backend"),
+    (create_llm, "llm_backend"),
+])
+def test_unknown_backend_names_are_rejected(factory, field):
+    with pytest.raises(ValueError, match="Unknown"):
+        factory(Settings(**{field: "nope"}))
@@ -0,0 +1,183 @@
+import json
+import sys
+
+import numpy as np
+
+from teachi import audio
+
+RATE = 16000
+FRAMES = 4096
+
+
+def _tone(seconds, amplitude):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+def _noise(seconds, rms):
+    return np.random.default_rng(0).normal(0, rms, int(seconds * RATE))
+
+
+class _SilentRecognizer:
+    """Never recognizes anything, like Vosk on non-speech audio."""
+
+    def AcceptWaveform(self, data):
+        return False
+
+    def Result(self):
+        return json.dumps({"text": ""})
+
+    def PartialResult(self):
+        return json.dumps({"partial": ""})
+
+    def FinalResult(self):
+        return json.dumps({"text": ""})
+
+
+class _CountingRecognizer(_SilentRecognizer):
+    def __init__(self, partial=""):
+        self.fed = []
+        self.partial = partial
+
+    def AcceptWaveform(self, data):
+        self.fed.append(data.copy())
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": self.partial})
+
+
+def test_rms_matches_numpy():
+    frame = _noise(FRAMES / RATE, 500).astype(np.int16)
+    expected = np.sqrt(np.mean(frame.astype(np.float64) ** 2))
+    assert abs(audio.EnergyVad(FRAMES).rms(frame) - expected) < 1e-3 * expected
+
+
+def test_vad_adapts_to_steady_noise_above_threshold():
+    vad = audio.EnergyVad(FRAMES, threshold=300.0)
+    samples = _noise(8.0, 400).astype(np.int16)
+    frames = [samples[i:i + FRAMES] for i in range(0, len(samples) - FRAMES + 1, FRAMES)]
+    decisions = [vad.is_speech(frame) for frame in frames]
+    assert not any(decisions[-10:])
+
+
+def test_vad_detects_speech_over_noise():
+    vad = audio.EnergyVad(FRAMES, threshold=300.0)
+    for _ in range(20):
+        vad.is_speech(_noise(FRAMES / RATE, 400).astype(np.int16))
+    assert vad.is_speech(_tone(FRAMES / RATE, 8000).astype(np.int16))
+
+
+def test_noise_does_not_extend_listening(monkeypatch):
+    monkeypatch.setattr(audio, "_waveform_acceptor", lambda r: r.AcceptWaveform)
+    samples = np.concatenate([_tone(1.0, 4000), _noise(10.0, 400)]).astype(np.int16)
+    source = audio.ArraySource(samples, FRAMES)
+
+    text, stats = audio.recognize(_SilentRecognizer(), source, RATE, audio.EnergyVad(FRAMES),
+                                  timeout=5.0, phrase_time_limit=2.0)
+
+    assert text == ""
+    assert stats.audio_seconds < 2.5
+
+
+def test_long_silence_skips_the_recognizer(monkeypatch):
+    monkeypatch.setattr(audio, "_waveform_acceptor", lambda r: r.AcceptWaveform)
+    samples = np.concatenate([_tone(1.0, 4000), np.zeros(8 * RATE)]).astype(np.int16)
+    recognizer = _CountingRecognizer()
+
+    _, stats = audio.recognize(recognizer, audio.ArraySource(samples, FRAMES), RATE, audio.EnergyVad(FRAMES),
+                               timeout=10.0, phrase_time_limit=10.0, silence_hangover=2.0)
+
+    assert stats.frames == len(samples) // FRAMES
+    assert stats.skipped_frames > 0
+    assert len(recognizer.fed) == stats.frames - stats.skipped_frames
+    assert len(recognizer.fed) * FRAMES / RATE < 3.5
+
+
+def test_frame_before_speech_is_fed_again(monkeypatch):
+    monkeypatch.setattr(audio, "_waveform_acceptor", lambda r: r.AcceptWaveform)
+    onset = np.full(FRAMES, 7, dtype=np.int16)  # quiet, below the VAD threshold
+    samples = np.concatenate([np.zeros(12 * FRAMES), onset, _tone(FRAMES / RATE, 4000)]).astype(np.int16)
+    recognizer = _CountingRecognizer()
+
+    _, stats = audio.recognize(recognizer, audio.ArraySource(samples, FRAMES), RATE, audio.EnergyVad(FRAMES),
+                               timeout=10.0, phrase_time_limit=10.0, silence_hangover=1.0)
+
+    assert stats.skipped_frames > 0
+    assert (recognizer.fed[-2] == onset).all()
+
+
+def test_unfinished_utterance_ends_after_hangover(monkeypatch):
+    monkeypatch.setattr(audio, "_waveform_acceptor", lambda r: r.AcceptWaveform)
+    samples = np.concatenate([_tone(1.0, 4000), np.zeros(10 * RATE)]).astype(np.int16)
+    recognizer = _CountingRecognizer(partial="why do clouds")
+
+    _, stats = audio.recognize(recognizer, audio.ArraySource(samples, FRAMES), RATE, audio.EnergyVad(FRAMES),
+                               timeout=5.0, phrase_time_limit=5.0, silence_hangover=2.0)
+
+    assert stats.audio_seconds < 3.5
+
+
+def test_partials_are_throttled(monkeypatch):
+    monkeypatch.setattr(audio, "_waveform_acceptor", lambda r: r.AcceptWaveform)
+    samples = np.zeros(int(4.0 * RATE), dtype=np.int16)
+    source = audio.ArraySource(samples, FRAMES)
+
+    _, stats = audio.recognize(_SilentRecognizer(), source, RATE, None,
+                               timeout=4.0, phrase_time_limit=4.0, partial_interval=1.0)
+
+    assert stats.frames == 15
+    assert stats.partial_parses == 3
+
+
+class _Status:
+    def __init__(self, input_overflow):
+        self.input_overflow = input_overflow
+
+    def __bool__(self):
+        return self.input_overflow
+
+
+def test_microphone_ring_counts_overruns_and_overflows():
+    mic = audio.MicrophoneSource(RATE, 4, slots=4)
+    for i in range(10):
+        mic._callback(np.full(4, i, np.int16).tobytes(), 4, None, _Status(i == 9))
+
+    seen = []
+    while (frame := mic.read(timeout=0.01)) is not None:
+        seen.append(int(frame[0]))
+
+    assert seen == [7, 8, 9]
+    assert mic.dropped == 7 + 1
+
+
+class _BytesRecognizer(_SilentRecognizer):
+    """Public vosk API only: no _handle, expects bytes."""
+
+    def __init__(self):
+        self.fed = []
+
+    def AcceptWaveform(self, data):
+        assert isinstance(data, bytes)
+        self.fed.append(data)
+        return False
+
+
+def test_acceptor_falls_back_to_bytes_without_vosk_internals():
+    frame = np.arange(FRAMES, dtype=np.int16)
+    recognizer = _BytesRecognizer()
+
+    accept = audio._waveform_acceptor(recognizer)
+
+    assert accept(frame) is False
+    assert recognizer.fed == [frame.tobytes()]
+
+
+def test_acceptor_falls_back_to_bytes_without_vosk(monkeypatch):
+    monkeypatch.setitem(sys.modules, "vosk", None)
+    frame = np.arange(FRAMES, dtype=np.int16)
+    recognizer = _BytesRecognizer()
+
+    audio._waveform_acceptor(recognizer)(frame)
+
+    assert recognizer.fed == [frame.tobytes()]
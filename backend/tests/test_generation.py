@@ -0,0 +1,60 @@
+from teachi.generation import GenerationBudget, drop_partial_word, trim_to_budget
+
+
+def budget(max_words=50, max_sentences=10):
+    return GenerationBudget(num_predict=100, max_words=max_words, max_sentences=max_sentences, deadline=5.0)
+
+
+def test_under_budget_is_not_done():
+    assert trim_to_budget("Clouds form when vapour cools.", budget()) == ("Clouds form when vapour cools.", False)
+
+
+def test_sentence_budget_cuts_after_last_allowed_sentence():
+    text = "Water heats up. It rises. It cools. "
+    assert trim_to_budget(text, budget(max_sentences=2)) == ("Water heats up. It rises.", True)
+
+
+def test_trailing_terminator_only_counts_when_final():
+    text = "Water heats up. It rises."
+    assert trim_to_budget(text, budget(max_sentences=2)) == (text, False)
+    assert trim_to_budget(text, budget(max_sentences=2), final=True) == (text, True)
+
+
+def test_word_budget_prefers_last_full_sentence():
+    text = "Yes. Clouds form when vapour cools. Droplets gather into rain "
+    assert trim_to_budget(text, budget(max_words=8)) == ("Yes. Clouds form when vapour cools.", True)
+
+
+def test_word_budget_ignores_sentence_end_that_keeps_under_half():
+    text = "Sure! " + " ".join(f"w{i}" for i in range(60)) + " "
+    trimmed, done = trim_to_budget(text, budget(max_words=50))
+    assert done
+    assert len(trimmed.split()) == 50
+    assert trimmed.endswith("w48")
+
+
+def test_word_budget_cuts_on_original_text_with_extra_whitespace():
+    text = "Yes.  Clouds  form  when  vapour  cools. Droplets  gather  into  rain "
+    assert trim_to_budget(text, budget(max_words=9)) == ("Yes.  Clouds  form  when  vapour  cools.", True)
+
+
+def test_word_budget_without_sentence_end_cuts_at_word_boundary():
+    text = "one two  three\nfour five six "
+    assert trim_to_budget(text, budget(max_words=4)) == ("one two  three\nfour", True)
+
+
+def test_unfinished_last_word_is_not_counted():
+    text = "one two three four evapor"
+    assert trim_to_budget(text, budget(max_words=5)) == (text, False)
+    assert trim_to_budget(text + "ation ", budget(max_words=5)) == ("one two three four evaporation", True)
+
+
+def test_unfinished_last_word_counts_when_final():
+    assert trim_to_budget("one two three four evapor", budget(max_words=5), final=True) == ("one two three four evapor", True)
+
+
+def test_drop_partial_word():
+    assert drop_partial_word("and then evapor") == "and then"
+    assert drop_partial_word("and then evaporation ") == "and then evaporation"
+    assert drop_partial_word("Water evaporates.") == "Water evaporates."
+    assert drop_partial_word("") == ""
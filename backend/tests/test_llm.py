@@ -0,0 +1,107 @@
+import http.server
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from teachi.config import Settings
+from teachi.generation import GenerationBudget
+from teachi.llm import LLMError, OllamaLLM
+
+BUDGET = GenerationBudget(num_predict=100, max_words=50, max_sentences=5, deadline=0.8)
+
+
+class _FakeOllama(http.server.BaseHTTPRequestHandler):
+    """Sends a few tokens, then stalls without closing the connection."""
+
+    tokens = ["Clouds", " form", " when", " vapour", " cools"]
+    interval = 0.1
+    stall = 3.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for token in self.tokens:
+            self.wfile.write(json.dumps({"response": token, "done": False}).encode() + b"\n")
+            self.wfile.flush()
+            time.sleep(self.interval)
+        time.sleep(self.stall)
+
+
+class _SubwordOllama(_FakeOllama):
+    """Stalls after half of a word has been streamed."""
+
+    tokens = ["Clouds", " form", " when", " vapour", " co"]
+
+
+def _serve(handler):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def ollama_url():
+    server = _serve(_FakeOllama)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_deadline_returns_partial_answer_on_time(ollama_url):
+    llm = OllamaLLM(Settings(ollama_url=ollama_url))
+    start = time.monotonic()
+    text = llm.generate("Why do clouds form?", BUDGET)
+    elapsed = time.monotonic() - start
+
+    assert text == "Clouds form when vapour"
+    assert elapsed < BUDGET.deadline + 0.3
+
+
+def test_deadline_drops_half_streamed_word():
+    server = _serve(_SubwordOllama)
+    try:
+        llm = OllamaLLM(Settings(ollama_url=f"http://127.0.0.1:{server.server_address[1]}"))
+        assert llm.generate("Why do clouds form?", BUDGET) == "Clouds form when vapour"
+    finally:
+        server.shutdown()
+
+
+class _MissingModel(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"error": "model 'qwen2.5:7b' not found"}).encode()
+        self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_http_errors_are_raised_not_reported_as_timeouts():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _MissingModel)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        llm = OllamaLLM(Settings(ollama_url=f"http://127.0.0.1:{server.server_address[1]}"))
+        with pytest.raises(LLMError, match="404"):
+            llm.generate("Why do clouds form?", BUDGET)
+    finally:
+        server.shutdown()
+
+
+def test_connection_refused_is_raised():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    llm = OllamaLLM(Settings(ollama_url=f"http://127.0.0.1:{port}"))
+    with pytest.raises(LLMError):
+        llm.generate("Why do clouds form?", BUDGET)
@@ -0,0 +1,243 @@
+import hashlib
+import http.server
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+
+import pytest
+
+from teachi import provisioning
+
+NAME = "vosk-model-small-en-us-0.15"
+
+
+def _model_zip() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(f"{NAME}/am/final.mdl", os.urandom(200_000))
+        zf.writestr(f"{NAME}/conf/model.conf", "--sample-frequency=16000\n")
+    return buf.getvalue()
+
+
+class _Server(http.server.BaseHTTPRequestHandler):
+    """Serves one archive with Range support; can drop the connection halfway."""
+
+    body = b""
+    checksum = None
+    truncate = False
+    delay = 0.0
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.endswith(".sha256"):
+            checksum = type(self).checksum
+            self.send_response(200 if checksum else 404)
+            self.send_header("Content-Length", str(len(checksum or b"")))
+            self.end_headers()
+            self.wfile.write(checksum or b"")
+            return
+        type(self).requests.append(self.headers.get("Range"))
+        total = len(self.body)
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        start = int(match.group(1)) if match else 0
+        if start >= total and match:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{total}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = self.body[start:]
+        if match:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{total - 1}/{total}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        time.sleep(self.delay)
+        if type(self).truncate:
+            type(self).truncate = False
+            data = data[:len(data) // 2]
+        self.wfile.write(data)
+        self.close_connection = True
+
+
+@pytest.fixture
+def mirror():
+    _Server.body = _model_zip()
+    _Server.checksum = None
+    _Server.truncate = False
+    _Server.delay = 0.0
+    _Server.requests = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Server)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _downloads(cache):
+    return sorted(os.listdir(os.path.join(cache, "downloads")))
+
+
+def test_truncated_download_is_kept_as_part_and_resumed(mirror, tmp_path):
+    cache = str(tmp_path)
+    _Server.truncate = True
+    with pytest.raises(provisioning.ProvisioningError, match="re-run to resume"):
+        provisioning.provision(NAME, cache, mirror=mirror)
+    assert _downloads(cache) == [f"{NAME}.zip.part"]
+
+    digest = hashlib.sha256(_Server.body).hexdigest()
+    path = provisioning.provision(NAME, cache, mirror=mirror, sha256=digest)
+
+    assert _Server.requests[-1] == f"bytes={len(_Server.body) // 2}-"
+    assert provisioning.is_complete(path)
+    assert provisioning.resolve_model(NAME, cache) == path
+    assert _downloads(cache) == []
+
+
+def test_complete_part_is_promoted_on_416(mirror, tmp_path):
+    cache = str(tmp_path)
+    os.makedirs(os.path.join(cache, "downloads"))
+    with open(os.path.join(cache, "downloads", f"{NAME}.zip.part"), "wb") as f:
+        f.write(_Server.body)
+
+    path = provisioning.provision(NAME, cache, mirror=mirror)
+
+    assert provisioning.is_complete(path)
+    assert _Server.requests == [f"bytes={len(_Server.body)}-"]
+
+
+def test_oversized_part_restarts_download(mirror, tmp_path):
+    cache = str(tmp_path)
+    os.makedirs(os.path.join(cache, "downloads"))
+    with open(os.path.join(cache, "downloads", f"{NAME}.zip.part"), "wb") as f:
+        f.write(_Server.body + b"garbage")
+
+    path = provisioning.provision(NAME, cache, mirror=mirror)
+
+    assert provisioning.is_complete(path)
+    assert _Server.requests[-1] is None
+
+
+def test_checksum_mismatch_discards_download(mirror, tmp_path):
+    cache = str(tmp_path)
+    with pytest.raises(provisioning.ProvisioningError, match="Checksum mismatch"):
+        provisioning.provision(NAME, cache, mirror=mirror, sha256="0" * 64)
+    assert _downloads(cache) == []
+
+
+def test_local_archive_and_half_extracted_directory(tmp_path):
+    archive = tmp_path / f"{NAME}.zip"
+    archive.write_bytes(_model_zip())
+    cache = str(tmp_path / "cache")
+    os.makedirs(os.path.join(cache, "vosk", NAME, "am"))
+
+    with pytest.raises(provisioning.ProvisioningError):
+        provisioning.resolve_model(NAME, cache)
+    path = provisioning.provision(NAME, cache, source=str(archive))
+
+    assert sorted(os.listdir(path)) == [".teachi-model.json", "am", "conf"]
+
+
+def test_corrupt_download_is_discarded(mirror, tmp_path):
+    cache = str(tmp_path)
+    _Server.body = b"PK\x03\x04" + os.urandom(5_000)
+
+    with pytest.raises(provisioning.ProvisioningError, match="Corrupt archive"):
+        provisioning.provision(NAME, cache, mirror=mirror)
+
+    assert _downloads(cache) == []
+    assert not os.path.exists(provisioning.model_dir(provisioning.MODELS[NAME], cache))
+
+
+def test_mirror_checksum_file_is_verified(mirror, tmp_path):
+    cache = str(tmp_path)
+    _Server.checksum = b"0" * 64 + f"  {NAME}.zip\n".encode()
+
+    with pytest.raises(provisioning.ProvisioningError, match="Checksum mismatch"):
+        provisioning.provision(NAME, cache, mirror=mirror)
+
+    _Server.checksum = hashlib.sha256(_Server.body).hexdigest().encode()
+    path = provisioning.provision(NAME, cache, mirror=mirror)
+    assert provisioning.read_marker(path)["sha256"] == _Server.checksum.decode()
+
+
+def test_local_checksum_file_is_verified(tmp_path):
+    archive = tmp_path / f"{NAME}.zip"
+    archive.write_bytes(_model_zip())
+    (tmp_path / f"{NAME}.zip.sha256").write_text("f" * 64 + "\n")
+
+    with pytest.raises(provisioning.ProvisioningError, match="Checksum mismatch"):
+        provisioning.provision(NAME, str(tmp_path / "cache"), source=str(archive))
+
+
+def test_installed_model_is_checked_against_pinned_digest(tmp_path):
+    cache = str(tmp_path / "cache")
+    old = tmp_path / "old.zip"
+    old.write_bytes(_model_zip())
+    first = provisioning.provision(NAME, cache, source=str(old))
+
+    new = tmp_path / "new.zip"
+    new.write_bytes(_model_zip())
+    digest = hashlib.sha256(new.read_bytes()).hexdigest()
+
+    # Same digest: nothing to do. Different digest: reinstalled in place.
+    assert provisioning.provision(NAME, cache, source=str(new), sha256=provisioning.read_marker(first)["sha256"]) == first
+    path = provisioning.provision(NAME, cache, source=str(new), sha256=digest)
+
+    assert path == first
+    assert provisioning.read_marker(path)["sha256"] == digest
+    assert sorted(os.listdir(os.path.dirname(path))) == [NAME]
+
+
+def test_resolve_ignores_half_extracted_legacy_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = str(tmp_path / "cache")
+    os.makedirs(os.path.join(NAME, "am"))
+
+    with pytest.raises(provisioning.ProvisioningError, match="incomplete"):
+        provisioning.resolve_model(NAME, cache)
+
+    os.makedirs(os.path.join(NAME, "conf"))
+    open(os.path.join(NAME, "am", "final.mdl"), "wb").close()
+    open(os.path.join(NAME, "conf", "model.conf"), "w").close()
+    assert provisioning.resolve_model(NAME, cache) == NAME
+
+
+def test_archive_without_model_files_is_rejected(tmp_path):
+    archive = tmp_path / f"{NAME}.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr(f"{NAME}/README", "not a model")
+
+    with pytest.raises(provisioning.ProvisioningError, match="missing: am/final.mdl"):
+        provisioning.provision(NAME, str(tmp_path / "cache"), source=str(archive))
+    assert not os.path.exists(provisioning.model_dir(provisioning.MODELS[NAME], str(tmp_path / "cache")))
+
+
+def test_concurrent_provisioners_download_once(mirror, tmp_path):
+    cache = str(tmp_path)
+    _Server.delay = 0.3
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(provisioning.provision(NAME, cache, mirror=mirror))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(set(results)) == 1 and provisioning.is_complete(results[0])
+    assert _Server.requests == [None]